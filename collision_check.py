@@ -1,3 +1,5 @@
+import bisect
+
 from .geometry import Rectangle, Cuboid
 
 
@@ -8,13 +10,124 @@ class BoxCollision:
 
     def __init__(self, printbed, printhead, gantry, gantry_x_oriented,
                  gantry_height, padding, current_objects=None):
-        self.printbed = printbed
-        self.printhead = printhead
+        self._printbed = printbed
+        self._printhead = printhead
         self.gantry = gantry
-        self.gantry_x_oriented = gantry_x_oriented
+        self._gantry_x_oriented = gantry_x_oriented
+        self._cache_geometry()
         self.gantry_height = gantry_height
+        # The objects are only changed through add_object and clear_objects,
+        # which keep the projections and indexes below in sync with them
+        self._objects = list(current_objects or [])
+        # Projections of all current objects onto the XY-plane, only
+        # computed once when an object is added
+        self._object_projections = [obj.projection()
+                                    for obj in self._objects]
         self.padding = padding
-        self.current_objects = current_objects or []
+        # Broad phase indexes for object_collides by padding and axis, see
+        # _get_index
+        self._indexes = {}
+
+    @property
+    def printbed(self):
+        return self._printbed
+
+    @printbed.setter
+    def printbed(self, printbed):
+        self._printbed = printbed
+        self._cache_geometry()
+
+    @property
+    def printhead(self):
+        return self._printhead
+
+    @printhead.setter
+    def printhead(self, printhead):
+        self._printhead = printhead
+        self._cache_geometry()
+
+    @property
+    def gantry_x_oriented(self):
+        return self._gantry_x_oriented
+
+    @gantry_x_oriented.setter
+    def gantry_x_oriented(self, gantry_x_oriented):
+        self._gantry_x_oriented = gantry_x_oriented
+        self._cache_geometry()
+
+    def _cache_geometry(self):
+        """Store the values derived from printbed, printhead and
+        gantry_x_oriented that the collision checks and searches need on
+        every call. The setters of these attributes call this again, so
+        the values always match them.
+        """
+        # Index of the axis perpendicular to the gantry, along which the
+        # sweeps run, and of the side axis parallel to the gantry
+        self._main_axis = int(self._gantry_x_oriented)
+        self._side_axis = 1 - self._main_axis
+        self._printer_main = self._printbed.get_range_for_axis(
+            self._main_axis)
+        self._printer_side = self._printbed.get_range_for_axis(
+            self._side_axis)
+        self._printhead_main = self._printhead.get_range_for_axis(
+            self._main_axis)
+        # Pick the implementation matching the gantry orientation once
+        # instead of branching on every call. This is the plain function
+        # rather than a bound method, so that copies of this object use
+        # their own attributes and there is no reference cycle.
+        self._moving_gantry = (BoxCollision._moving_gantry_x_oriented
+                               if self._gantry_x_oriented
+                               else BoxCollision._moving_gantry_y_oriented)
+
+    @property
+    def current_objects(self):
+        """Tuple of all objects added so far. Use add_object and
+        clear_objects to change them.
+        """
+        return tuple(self._objects)
+
+    def _get_index(self):
+        """Return the broad phase index for object_collides over the ranges
+        of all current objects along the axis perpendicular to the gantry.
+
+        The stored bounds have the padding applied already, so there is one
+        index per padding and axis, built when that combination is first
+        used. Shallow copies share the indexes just like the list of objects,
+        and add_object and clear_objects update all of them, so that an index
+        always matches the objects it is used with.
+        """
+        key = (self.padding, self._main_axis)
+        index = self._indexes.get(key)
+        if index is None:
+            entries = [self._index_entry(obj, *key) for obj in self._objects]
+            index = _SortedIndex(entry for entry in entries if entry)
+            self._indexes[key] = index
+        return index
+
+    def _index_entry(self, obj, pad, axis):
+        """Return the entry for obj in the index as (bounds, min, max), or
+        None if obj can't collide with anything with padding pad. The range
+        is taken along axis.
+
+        The bounds are a plain tuple (x, y, z, max_x, max_y, max_z) with the
+        padding added to the upper ends, so the collision checks need neither
+        attribute lookups nor arithmetic. Adding the padding here gives
+        exactly the same values that collides_with computes.
+        """
+        x, y, z, max_x, max_y, max_z = obj.as_tuple()
+        max_x += pad
+        max_y += pad
+        max_z += pad
+        if not (max_x > x and max_y > y):
+            # Like in collides_with, an object that has no extent on an axis,
+            # even with padding, never collides.
+            return None
+        if not max_z > z:
+            # Without extent on the Z-Axis only the printhead, which ignores
+            # that axis, can collide with the object
+            max_z = float('-inf')
+        bounds = (x, y, z, max_x, max_y, max_z)
+        return bounds, bounds[axis], bounds[axis + 3]
 
     def moving_parts(self, print_object):
         """Return collision boxes for the moving parts (printhead and gantry)
@@ -23,38 +136,51 @@ class BoxCollision:
 
         print_object can be either a Rectangle or a Cuboid
         """
-        moving_printhead = Rectangle(
+        # Both boxes add up bounds that are in order already, so the sums are
+        # in order as well and the checks in the constructors can be skipped.
+        moving_printhead = Rectangle._from_ordered(
             print_object.x + self.printhead.x,
             print_object.y + self.printhead.y,
             print_object.max_x + self.printhead.max_x,
             print_object.max_y + self.printhead.max_y,
         )
-        if self.gantry_x_oriented:
-            moving_gantry = Cuboid(
-                self.gantry.x,
-                print_object.y + self.gantry.y,
-                self.gantry_height,
-                self.gantry.max_x,
-                print_object.max_y + self.gantry.max_y,
-                float('inf'),  # Make the box extend ALL THE WAY to the top
-            )
-        else:
-            moving_gantry = Cuboid(
-                print_object.x + self.gantry.x,
-                self.gantry.y,
-                self.gantry_height,
-                print_object.max_x + self.gantry.max_x,
-                self.gantry.max_y,
-                float('inf'),
-            )
-        return moving_printhead, moving_gantry
+        return moving_printhead, self._moving_gantry(self, print_object)
+
+    def _moving_gantry_x_oriented(self, print_object):
+        """Return the collision box of a gantry parallel to the X-Axis"""
+        return Cuboid._from_ordered(
+            self.gantry.x,
+            print_object.y + self.gantry.y,
+            self.gantry_height,
+            self.gantry.max_x,
+            print_object.max_y + self.gantry.max_y,
+            float('inf'),  # Make the box extend ALL THE WAY to the top
+        )
+
+    def _moving_gantry_y_oriented(self, print_object):
+        """Return the collision box of a gantry parallel to the Y-Axis"""
+        return Cuboid._from_ordered(
+            print_object.x + self.gantry.x,
+            self.gantry.y,
+            self.gantry_height,
+            print_object.max_x + self.gantry.max_x,
+            self.gantry.max_y,
+            float('inf'),
+        )
 
     def fits_in_printer(self, new_object):
         """Return True if the object is situated within the printer boundaries
 
         new_object must be a Cuboid
         """
-        return self.printbed.intersection(new_object) == new_object
+        # contains() answers this without building the intersection. The
+        # comparison with the intersection only differs for objects without
+        # extent on an axis: these count as fitting as long as they don't lie
+        # below the printer on that axis, even beyond its upper end. Keep
+        # that by falling back to the intersection.
+        printbed = self.printbed
+        return (printbed.contains(new_object) or
+                printbed.intersection(new_object) == new_object)
 
     def object_collides(self, new_object):
         """Return True if printing this object would cause a collision, False
@@ -65,26 +191,81 @@ class BoxCollision:
         if not self.fits_in_printer(new_object):
             # Doesn't fit in the printer at all!
             return True
+        if not self._objects:
+            # Nothing to collide with, skip building the moving parts
+            return False
 
         mv_printhead, mv_gantry = self.moving_parts(new_object)
-        for obj in self.current_objects:
-            if (new_object.collides_with(obj, self.padding) or
-                mv_printhead.collides_with(obj.projection(), self.padding) or
-                mv_gantry.collides_with(obj, self.padding)):
+        # The tests below do exactly what collides_with does with padding:
+        # on every axis, both boxes must reach past the start of the other
+        # and past their own start once the padding is added to their ends.
+        # The stored bounds have the padding added already, so it only needs
+        # to be added to these three boxes, once.
+        pad = self.padding
+        n_x, n_y, n_z, n_max_x, n_max_y, n_max_z = new_object.as_tuple()
+        n_max_x += pad
+        n_max_y += pad
+        n_max_z += pad
+        p_x, p_y, p_max_x, p_max_y = mv_printhead.as_tuple()
+        p_max_x += pad
+        p_max_y += pad
+        # The gantry box extends all the way to the top, so it only matters
+        # how far up an object reaches
+        g_x, g_y, g_z, g_max_x, g_max_y, _ = mv_gantry.as_tuple()
+        g_max_x += pad
+        g_max_y += pad
+        check_printhead = p_max_x > p_x and p_max_y > p_y
+        check_gantry = g_max_x > g_x and g_max_y > g_y
+        # The printhead normally surrounds the nozzle, so its box covers the
+        # object from above. Since the printhead test ignores the Z-Axis, any
+        # collision of the object itself is then caught by that test already.
+        check_object = (n_max_x > n_x and n_max_y > n_y and n_max_z > n_z and
+                        not mv_printhead.contains(new_object))
+
+        # Only objects overlapping any of the three boxes on the axis
+        # perpendicular to the gantry can collide at all. The gantry spans
+        # the other axis anyway, so there is nothing to prune on that one.
+        index = self._get_index()
+        if self._main_axis:
+            candidates = index.query(min(n_y, p_y, g_y),
+                                     max(n_max_y, p_max_y, g_max_y))
+        else:
+            candidates = index.query(min(n_x, p_x, g_x),
+                                     max(n_max_x, p_max_x, g_max_x))
+        # Test against all candidates at once, checking printhead, gantry and
+        # object in a single pass.
+        for x, y, z, max_x, max_y, max_z in candidates:
+            if ((check_printhead and
+                 p_max_x > x and max_x > p_x and
+                 p_max_y > y and max_y > p_y) or
+                (check_gantry and max_z > g_z and
+                 g_max_x > x and max_x > g_x and
+                 g_max_y > y and max_y > g_y) or
+                (check_object and
+                 n_max_x > x and max_x > n_x and
+                 n_max_y > y and max_y > n_y and
+                 n_max_z > z and max_z > n_z)):
                 return True
         return False
-    
+
     def add_object(self, new_object):
         """Add an object, like a finished print job, to be considered in the
         future.
 
         objects must be Cuboids
         """
-        self.current_objects.append(new_object)
+        for key, index in self._indexes.items():
+            entry = self._index_entry(new_object, *key)
+            if entry:
+                index.insert(*entry)
+        self._objects.append(new_object)
+        self._object_projections.append(new_object.projection())
 
     def clear_objects(self):
         """Empty the list of print objects to keep track of"""
-        self.current_objects.clear()
+        self._objects.clear()
+        self._object_projections.clear()
+        self._indexes.clear()
 
 
     def find_offset(self, object_cuboid):
@@ -126,7 +307,7 @@ class BoxCollision:
         needed_space = mv_printhead.grow(self.padding)
 
         gantry_blocked = self.get_gantry_collisions(new_object)
-        object_boxes = [obj.projection() for obj in self.current_objects]
+        object_boxes = self._object_projections
         side_offsets = self._get_side_offsets(new_object, needed_space,
                                               object_boxes)
 
@@ -160,44 +341,43 @@ class BoxCollision:
         else:
             min_space = 0
 
-        ranges = []
-        for obj in self.current_objects:
-            if obj.max_z + self.padding > self.gantry_height:
-                if self.gantry_x_oriented:
-                    # Pad obj.y with gantry.max_y, because the gantry will
-                    # approach from the outsides
-                    new_range = [obj.y - self.gantry.max_y - self.padding,
-                                 obj.max_y - self.gantry.y + self.padding]
-                else:
-                    new_range = [obj.x - self.gantry.max_x - self.padding,
-                                 obj.max_x - self.gantry.x + self.padding]
-                ranges.append(new_range)
+        padding = self.padding
+        gantry = self.gantry
+        gantry_height = self.gantry_height
+        blocking = [obj for obj in self._objects
+                    if obj.max_z + padding > gantry_height]
+        if self.gantry_x_oriented:
+            # Pad obj.y with gantry.max_y, because the gantry will
+            # approach from the outsides
+            g_min, g_max = gantry.y, gantry.max_y
+            ranges = [(obj.y - g_max - padding, obj.max_y - g_min + padding)
+                      for obj in blocking]
+        else:
+            g_min, g_max = gantry.x, gantry.max_x
+            ranges = [(obj.x - g_max - padding, obj.max_x - g_min + padding)
+                      for obj in blocking]
         ranges = self._condense_ranges(ranges, min_space)
         if self.gantry_x_oriented:
-            boxes = [Rectangle(self.gantry.x, y, self.gantry.max_x, max_y)
+            boxes = [Rectangle(gantry.x, y, gantry.max_x, max_y)
                      for y, max_y in ranges]
         else:
-            boxes = [Rectangle(x, self.gantry.y, max_x, self.gantry.max_y)
+            boxes = [Rectangle(x, gantry.y, max_x, gantry.max_y)
                      for x, max_x in ranges]
         return boxes
 
     @staticmethod
     def _condense_ranges(ranges, min_space=0):
         """Consolidate ranges so that none of them overlap/border each other
-        ranges must be a 2-dimensional list with shape (n, 2).
-        WARNING: This function may mutate the ranges list as well as its
-        contained lists!"""
-        if not ranges:
-            return []
-        ranges.sort()
-        condensed = ranges[:1]
-        for r in ranges[1:]:
-            prev = condensed[-1]
-            if r[0] <= prev[1] + min_space:
-                if r[1] > prev[1]:
-                    prev[1] = r[1]
+        ranges must be an iterable of (min, max) pairs. The result is a new
+        list of [min, max] lists, the input is left unchanged.
+        """
+        condensed = []
+        for r_min, r_max in sorted(ranges):
+            if condensed and r_min <= condensed[-1][1] + min_space:
+                if r_max > condensed[-1][1]:
+                    condensed[-1][1] = r_max
             else:
-                condensed.append(r)
+                condensed.append([r_min, r_max])
         return condensed
 
     def _get_side_offsets(self, new_object, space, boxes):
@@ -207,32 +387,28 @@ class BoxCollision:
         initial starting space don't need to be checked as there is always an
         opposing, closer side.
         """
-        o_min, o_max = new_object.get_range_for_axis(not self.gantry_x_oriented)
-        space_min, space_max = space.get_range_for_axis(
-                not self.gantry_x_oriented)
-        printer_min, printer_max = self.printbed.get_range_for_axis(
-                not self.gantry_x_oriented)
+        o_min, o_max = new_object.get_range_for_axis(self._side_axis)
+        space_min, space_max = space.get_range_for_axis(self._side_axis)
+        printer_min, printer_max = self._printer_side
+        ranges = [r.get_range_for_axis(self._side_axis)
+                  for r in boxes]
         # Put offsets in a set initially to remove any duplicates
         # Add 0 manually to search without any side offset first
         unique_offsets = {0}
-        for r in boxes:
-            r_min, r_max = r.get_range_for_axis(not self.gantry_x_oriented)
-            if r_max > space_min:
-                # Upper bound counts
-                offset = r_max - space_min
-                if o_max + offset <= printer_max:
-                    # Upper bound fits
-                    unique_offsets.add(offset)
-            if r_min < space_max:
-                # Lower bound counts
-                offset = r_min - space_max
-                if o_min + offset >= printer_min:
-                    # Lower bound fits
-                    unique_offsets.add(offset)
-        offsets = list(unique_offsets)
+        # Upper bounds count if they lie above the lower edge of the space
+        # and fit when moving there
+        unique_offsets.update(
+            r_max - space_min for _, r_max in ranges
+            if r_max > space_min
+            and o_max + (r_max - space_min) <= printer_max)
+        # Lower bounds count if they lie below the upper edge of the space
+        # and fit when moving there
+        unique_offsets.update(
+            r_min - space_max for r_min, _ in ranges
+            if r_min < space_max
+            and o_min + (r_min - space_max) >= printer_min)
         # Sort using abs, meaning from the middle out
-        offsets.sort(key=abs)
-        return offsets
+        return sorted(unique_offsets, key=abs)
 
     def _iterate_offset(self, new_object, needed_space,
                         gantry_blocked, objects, side_offsets):
@@ -255,71 +431,125 @@ class BoxCollision:
         The offset where the print object fits as a 2-tuple.
         If no space was found, None is returned.
         """
+        # Reduce all boxes to their ranges on both axes once, so that no
+        # Rectangles need to be translated or even looked at by the sweeps.
+        object_ranges = self._get_axis_ranges(objects)
+        gantry_ranges = self._get_axis_ranges(gantry_blocked)
+        space_side_min, space_side_max = needed_space.get_range_for_axis(
+            self._side_axis)
+        o_side_min, o_side_max = new_object.get_range_for_axis(
+            self._side_axis)
+        # The result of a sweep only depends on which boxes overlap on the
+        # side axis. If a side offset leads to the same boxes as an earlier,
+        # failed sweep, it will fail as well and can be skipped.
+        failed = set()
         for offset in side_offsets:
-            offsets = (offset * self.gantry_x_oriented,
-                       offset * (not self.gantry_x_oriented))
-            result = self._sweep(new_object.translate(*offsets),
-                                 needed_space.translate(*offsets),
-                                 gantry_blocked, objects)
-            if result is not None:
+            sweep_objects = self._get_main_ranges(space_side_min + offset,
+                                                  space_side_max + offset,
+                                                  object_ranges)
+            sweep_gantry = self._get_main_ranges(o_side_min + offset,
+                                                 o_side_max + offset,
+                                                 gantry_ranges)
+            key = (tuple(sweep_objects), tuple(sweep_gantry))
+            if key in failed:
+                continue
+            result = self._sweep(new_object, needed_space,
+                                 sweep_gantry, sweep_objects)
+            if result is None:
+                failed.add(key)
+            else:
                 # Merge both offsets
-                return (result[0] + offsets[0], result[1] + offsets[1])
+                result[self._side_axis] = offset
+                return tuple(result)
         return None
 
-    def _sweep(self, new_object, space, gantry_blocked, objects):
+    def _get_axis_ranges(self, boxes):
+        """Return the ranges of all boxes as tuples of the form
+        (side_min, side_max, main_min, main_max), where the side axis is the
+        one parallel to the gantry.
+        Boxes without extent on either axis are left out, because just like
+        in collides_with they can never collide.
+        """
+        ranges = [r.get_range_for_axis(self._side_axis)
+                  + r.get_range_for_axis(self._main_axis)
+                  for r in boxes]
+        return [r for r in ranges if r[1] > r[0] and r[3] > r[2]]
+
+    def _sweep(self, new_object, space, gantry_ranges, object_ranges):
         """The main, innermost searching function.
         Scans along the main axis (the one perpendicular to the gantry) by
         iteratively increasing the offset just enough to clear all objects we
         have collided with so far by doing that. Iteration stops when on both
         sides the printer boundaries are met or a valid spot is found.
 
+        The scan itself only works on the ranges of the boxes along the main
+        axis, so that no new Rectangles need to be created while iterating.
+
         Parameters:
-        new_object and space are like in _iterate_offset, but with the current
-        side offset applied.
+        new_object and space are like in _iterate_offset. gantry_ranges and
+        object_ranges are the ranges along the main axis of those gantry
+        stripes and objects that overlap with new_object and space
+        respectively at the current side offset.
 
         Returns:
         The offset where we found enough space as a 2-long list. Only the
         component of the main axis is set, the other will always be 0. If no
         space was found, None is returned.
         """
-        offset = [0, 0]
-        # Set to True when reaching the printer boundaries without success
-        reached_end_min = reached_end_max = False
+        offset = 0
 
-        printer_min, printer_max = self.printbed.get_range_for_axis(
-            self.gantry_x_oriented)
-        printhead_min, printhead_max = self.printhead.get_range_for_axis(
-            self.gantry_x_oriented)
+        printer_min, printer_max = self._printer_main
+        printhead_min, printhead_max = self._printhead_main
 
-        space_min, space_max = space.get_range_for_axis(self.gantry_x_oriented)
+        space_min, space_max = space.get_range_for_axis(self._main_axis)
         # These are needed to check if the offset object fits on the printbed
-        o_min, o_max = new_object.get_range_for_axis(self.gantry_x_oriented)
+        o_min, o_max = new_object.get_range_for_axis(self._main_axis)
+
+        # Where the needed space has to move to for clearing a gantry stripe.
+        # The stripes are compared against the print object edges, so change
+        # that to needed space edges.
+        gantry_ranges = [(r_min, r_max,
+                          r_min + (printhead_max + self.padding),
+                          r_max + (printhead_min - self.padding))
+                         for r_min, r_max in gantry_ranges]
 
         # Positions where to move to next:
         # next_min_pos specifies where to move the upper edge down to
         # next_max_pos specifies where to move the lower edge up to
         next_min_pos, next_max_pos = space_max, space_min
 
-        colliding = self._get_colliding_objects(space, objects)
-        gantry_colliding = self._get_colliding_objects(
-                new_object, gantry_blocked)
-        while colliding or gantry_colliding:
-            # Find furthest colliding object to clear in both directions
-            for r in gantry_colliding:
-                r_min, r_max = r.get_range_for_axis(self.gantry_x_oriented)
-                # Change from comparing print object edges to needed space edges
-                r_min += printhead_max + self.padding
-                r_max += printhead_min - self.padding
-                if r_min < next_min_pos:
-                    next_min_pos = r_min
-                if r_max > next_max_pos:
-                    next_max_pos = r_max
-            for r in colliding:
-                r_min, r_max = r.get_range_for_axis(self.gantry_x_oriented)
-                if r_min < next_min_pos:
-                    next_min_pos = r_min
-                if r_max > next_max_pos:
-                    next_max_pos = r_max
+        # Each step only needs to look at the objects around the current
+        # position, use the ranges themselves as ids to get them back directly.
+        object_index = _SortedIndex((r, r[0], r[1]) for r in object_ranges)
+
+        while True:
+            # Find all colliding objects and the furthest one to clear in both
+            # directions within the same pass
+            # Like in collides_with, the space and the object only collide
+            # with anything if they have some extent themselves.
+            colliding = False
+            s_min = space_min + offset
+            s_max = space_max + offset
+            if s_max > s_min:
+                for r_min, r_max in object_index.query(s_min, s_max):
+                    if s_max > r_min and r_max > s_min:
+                        colliding = True
+                        if r_min < next_min_pos:
+                            next_min_pos = r_min
+                        if r_max > next_max_pos:
+                            next_max_pos = r_max
+            n_min = o_min + offset
+            n_max = o_max + offset
+            if n_max > n_min:
+                for r_min, r_max, clear_min, clear_max in gantry_ranges:
+                    if n_max > r_min and r_max > n_min:
+                        colliding = True
+                        if clear_min < next_min_pos:
+                            next_min_pos = clear_min
+                        if clear_max > next_max_pos:
+                            next_max_pos = clear_max
+            if not colliding:
+                break
 
             # Set next offset to the closest side that still fits
             neg_offset = next_min_pos - space_max
@@ -328,20 +558,77 @@ class BoxCollision:
             reached_end_max = o_max + pos_offset > printer_max
             if ((pos_offset <= -neg_offset or reached_end_min)
                 and not reached_end_max):
-                offset[self.gantry_x_oriented] = pos_offset
+                offset = pos_offset
             elif not reached_end_min:
-                offset[self.gantry_x_oriented] = neg_offset
+                offset = neg_offset
             else:  # Reached both ends without success
                 return None
 
-            colliding = self._get_colliding_objects(
-                    space.translate(*offset), objects)
-            gantry_colliding = self._get_colliding_objects(
-                    new_object.translate(*offset), gantry_blocked)
-
-        return offset
+        result = [0, 0]
+        result[self._main_axis] = offset
+        return result
 
     @staticmethod
-    def _get_colliding_objects(one, other):
-        """Return a list of all objects in other that collide with one"""
-        return [r for r in other if one.collides_with(r)]
+    def _get_main_ranges(side_min, side_max, ranges):
+        """Return the main axis part of all ranges from _get_axis_ranges that
+        overlap with (side_min, side_max) on the side axis.
+        Nothing overlaps if (side_min, side_max) has no extent.
+        """
+        if not side_max > side_min:
+            return []
+        return [(r[2], r[3]) for r in ranges
+                if side_max > r[0] and r[1] > side_min]
+
+
+class _SortedIndex:
+    """Sort-and-prune index over ranges along a single axis.
+    The ranges are kept sorted by their lower bound, so that candidates for
+    overlapping a query range can be found by bisecting instead of looking
+    at every single range.
+    """
+
+    # Relative margin for the lower bound of a query. Subtracting the largest
+    # extent from the query rounds off at most a few units in the last place,
+    # which is around 1e-16 relative to the magnitudes involved. Widening the
+    # bound by far more than that means that rounding can never prune a range
+    # that overlaps the query, while it only admits additional candidates
+    # that are within nanometers of the query range.
+    _ROUNDING_MARGIN = 1e-9
+
+    def __init__(self, ranges=()):
+        """ranges can be an iterable of (id_, r_min, r_max) tuples to fill
+        the index with right away.
+        """
+        ranges = sorted(ranges, key=lambda r: r[1])
+        self._mins = [r[1] for r in ranges]
+        self._ids = [r[0] for r in ranges]
+        # The largest extent of any range. The lower bound of a range
+        # overlapping a query can lie at most this far below the query.
+        self._max_extent = max((r[2] - r[1] for r in ranges), default=0)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def insert(self, id_, r_min, r_max):
+        """Add a range that is identified by id_"""
+        i = bisect.bisect_right(self._mins, r_min)
+        self._mins.insert(i, r_min)
+        self._ids.insert(i, id_)
+        if r_max - r_min > self._max_extent:
+            self._max_extent = r_max - r_min
+
+    def clear(self):
+        self._mins.clear()
+        self._ids.clear()
+        self._max_extent = 0
+
+    def query(self, q_min, q_max):
+        """Return a list of the ids of all ranges that may overlap the range
+        from q_min to q_max. Ranges that can't overlap are left out, but the
+        remaining candidates still need to be checked exactly.
+        """
+        max_extent = self._max_extent
+        margin = (abs(q_min) + max_extent) * self._ROUNDING_MARGIN
+        lo = bisect.bisect_right(self._mins, q_min - max_extent - margin)
+        hi = bisect.bisect_left(self._mins, q_max)
+        return self._ids[lo:hi]
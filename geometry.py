@@ -1,5 +1,7 @@
 class Rectangle:
 
+    __slots__ = ('x', 'y', 'max_x', 'max_y')
+
     def __init__(self, x, y, max_x, max_y):
         if max_x < x:
             x, max_x = max_x, x
@@ -10,21 +12,47 @@ class Rectangle:
         self.max_x = max_x
         self.max_y = max_y
 
-        self.width = max_x - x
-        self.height = max_y - y
+    @classmethod
+    def _from_ordered(cls, x, y, max_x, max_y):
+        """Create a Rectangle from bounds that are already known to be in
+        order, skipping the checks in __init__.
+        """
+        rect = cls.__new__(cls)
+        rect.x = x
+        rect.y = y
+        rect.max_x = max_x
+        rect.max_y = max_y
+        return rect
+
+    # The sizes are only computed when needed, most Rectangles are created
+    # just for collision checks which don't use them.
+    @property
+    def width(self):
+        return self.max_x - self.x
+
+    @property
+    def height(self):
+        return self.max_y - self.y
 
     def get_area(self):
         return self.width * self.height
 
+    def as_tuple(self):
+        """Return the bounds as a plain tuple (x, y, max_x, max_y)"""
+        return (self.x, self.y, self.max_x, self.max_y)
+
     def __bool__(self):
         """Consider a rectangle as true if and only if its area is nonzero"""
-        return bool(self.width and self.height)
+        return self.max_x != self.x and self.max_y != self.y
 
     def __eq__(self, other):
-        return (self.x == other.x and
-                self.y == other.y and
-                self.max_x == other.max_x and
-                self.max_y == other.max_y)
+        return self is other or (self.x == other.x and
+                                 self.y == other.y and
+                                 self.max_x == other.max_x and
+                                 self.max_y == other.max_y)
+
+    def __hash__(self):
+        return hash(self.as_tuple())
 
     def intersection(self, other):
         """Return the intersection between two rectangles.
@@ -35,29 +63,56 @@ class Rectangle:
         y = max(self.y, other.y)
         max_x = min(self.max_x, other.max_x)
         max_y = min(self.max_y, other.max_y)
-        return Rectangle(x, y, max(max_x, x), max(max_y, y))
+        return Rectangle._from_ordered(x, y, max(max_x, x), max(max_y, y))
+
+    def get_overlap_area(self, other):
+        """Return the area of the intersection with another rectangle without
+        creating that intersection.
+        """
+        width = min(self.max_x, other.max_x) - max(self.x, other.x)
+        height = min(self.max_y, other.max_y) - max(self.y, other.y)
+        if width <= 0 or height <= 0:
+            return 0
+        return width * height
+
+    def contains(self, other):
+        """Return True if other lies completely within this rectangle"""
+        return (self.x <= other.x and self.y <= other.y and
+                self.max_x >= other.max_x and self.max_y >= other.max_y)
 
     def collides_with(self, other, padding=0):
         """Return, whether this rectangle collides with another rectangle.
         padding specifies a minimum distance that must be present between the
-        Rectangles to not collide."""
-        x = max(self.x, other.x)
-        y = max(self.y, other.y)
-        max_x = min(self.max_x, other.max_x)
-        max_y = min(self.max_y, other.max_y)
-        return max_x + padding > x and max_y + padding > y
+        Rectangles to not collide.
+        On each axis, the padded end of both rectangles must lie beyond the
+        start of the other one as well as their own start. The axes are
+        checked one after another, so that most disjoint rectangles are
+        rejected by the first one already.
+        """
+        max_x = self.max_x + padding
+        other_max_x = other.max_x + padding
+        if not (max_x > other.x and other_max_x > self.x and
+                max_x > self.x and other_max_x > other.x):
+            return False
+        max_y = self.max_y + padding
+        other_max_y = other.max_y + padding
+        return (max_y > other.y and other_max_y > self.y and
+                max_y > self.y and other_max_y > other.y)
 
     def grow(self, amount):
         """Return a new Rectangle with all sides grown by the given amount (or
         shrunk in case of negative values).
         """
-        return Rectangle(self.x - amount, self.y - amount,
-                         self.max_x + amount, self.max_y + amount)
+        # Only shrinking can turn the bounds around
+        create = Rectangle._from_ordered if amount >= 0 else Rectangle
+        return create(self.x - amount, self.y - amount,
+                      self.max_x + amount, self.max_y + amount)
 
     def translate(self, x_offset, y_offset):
         """Move the Rectangle by the given offset without changing its size"""
-        return Rectangle(self.x + x_offset, self.y + y_offset,
-                         self.max_x + x_offset, self.max_y + y_offset)
+        return Rectangle._from_ordered(
+            self.x + x_offset, self.y + y_offset,
+            self.max_x + x_offset, self.max_y + y_offset)
 
     def get_range_for_axis(self, axis):
         if axis == 1:  # Y-Axis
@@ -67,6 +122,8 @@ class Rectangle:
 
 class Cuboid:
 
+    __slots__ = ('x', 'y', 'z', 'max_x', 'max_y', 'max_z')
+
     def __init__(self, x, y, z, max_x, max_y, max_z):
         if max_x < x:
             x, max_x = max_x, x
@@ -81,23 +138,56 @@ class Cuboid:
         self.max_y = max_y
         self.max_z = max_z
 
-        self.width = max_x - x
-        self.height = max_y - y
-        self.z_height = max_z - z  # Yes, there are 2 heights. Get over it.
+    @classmethod
+    def _from_ordered(cls, x, y, z, max_x, max_y, max_z):
+        """Create a Cuboid from bounds that are already known to be in
+        order, skipping the checks in __init__.
+        """
+        cuboid = cls.__new__(cls)
+        cuboid.x = x
+        cuboid.y = y
+        cuboid.z = z
+        cuboid.max_x = max_x
+        cuboid.max_y = max_y
+        cuboid.max_z = max_z
+        return cuboid
+
+    @property
+    def width(self):
+        return self.max_x - self.x
+
+    @property
+    def height(self):
+        return self.max_y - self.y
+
+    @property
+    def z_height(self):
+        # Yes, there are 2 heights. Get over it.
+        return self.max_z - self.z
 
     def get_volume(self):
         return self.width * self.height * self.z_height
 
+    def as_tuple(self):
+        """Return the bounds as a plain tuple
+        (x, y, z, max_x, max_y, max_z)
+        """
+        return (self.x, self.y, self.z, self.max_x, self.max_y, self.max_z)
+
     def __bool__(self):
-        return bool(self.width and self.height and self.z_height)
+        return (self.max_x != self.x and self.max_y != self.y and
+                self.max_z != self.z)
 
     def __eq__(self, other):
-        return (self.x == other.x and
-                self.y == other.y and
-                self.z == other.z and
-                self.max_x == other.max_x and
-                self.max_y == other.max_y and
-                self.max_z == other.max_z)
+        return self is other or (self.x == other.x and
+                                 self.y == other.y and
+                                 self.z == other.z and
+                                 self.max_x == other.max_x and
+                                 self.max_y == other.max_y and
+                                 self.max_z == other.max_z)
+
+    def __hash__(self):
+        return hash(self.as_tuple())
 
     def intersection(self, other):
         x = max(self.x, other.x)
@@ -106,43 +196,72 @@ class Cuboid:
         max_x = min(self.max_x, other.max_x)
         max_y = min(self.max_y, other.max_y)
         max_z = min(self.max_z, other.max_z)
-        return Cuboid(x, y, z, max(max_x, x), max(max_y, y), max(max_z, z))
+        return Cuboid._from_ordered(x, y, z, max(max_x, x), max(max_y, y),
+                                    max(max_z, z))
+
+    def get_overlap_volume(self, other):
+        """Return the volume of the intersection with another cuboid without
+        creating that intersection.
+        """
+        width = min(self.max_x, other.max_x) - max(self.x, other.x)
+        height = min(self.max_y, other.max_y) - max(self.y, other.y)
+        z_height = min(self.max_z, other.max_z) - max(self.z, other.z)
+        if width <= 0 or height <= 0 or z_height <= 0:
+            return 0
+        return width * height * z_height
+
+    def contains(self, other):
+        """Return True if other lies completely within this cuboid"""
+        return (self.x <= other.x and self.y <= other.y and
+                self.z <= other.z and self.max_x >= other.max_x and
+                self.max_y >= other.max_y and self.max_z >= other.max_z)
 
     def collides_with(self, other, padding=0):
-        x = max(self.x, other.x)
-        y = max(self.y, other.y)
-        z = max(self.z, other.z)
-        max_x = min(self.max_x, other.max_x)
-        max_y = min(self.max_y, other.max_y)
-        max_z = min(self.max_z, other.max_z)
-        return (max_x + padding > x and
-                max_y + padding > y and
-                max_z + padding > z)
+        # Same as Rectangle.collides_with, extended by the Z-Axis
+        max_x = self.max_x + padding
+        other_max_x = other.max_x + padding
+        if not (max_x > other.x and other_max_x > self.x and
+                max_x > self.x and other_max_x > other.x):
+            return False
+        max_y = self.max_y + padding
+        other_max_y = other.max_y + padding
+        if not (max_y > other.y and other_max_y > self.y and
+                max_y > self.y and other_max_y > other.y):
+            return False
+        max_z = self.max_z + padding
+        other_max_z = other.max_z + padding
+        return (max_z > other.z and other_max_z > self.z and
+                max_z > self.z and other_max_z > other.z)
 
     def projection(self, axis=2):
         """Project the cuboid to a paraxial rectangle"""
         if axis == 2:  # Remove Z-axis
-            return Rectangle(self.x, self.y, self.max_x, self.max_y)
+            return Rectangle._from_ordered(self.x, self.y,
+                                           self.max_x, self.max_y)
         if axis == 1:  # Remove Y-axis
-            return Rectangle(self.x, self.z, self.max_x, self.max_z)
+            return Rectangle._from_ordered(self.x, self.z,
+                                           self.max_x, self.max_z)
         # Remove X-axis
-        return Rectangle(self.y, self.z, self.max_y, self.max_z)
+        return Rectangle._from_ordered(self.y, self.z, self.max_y, self.max_z)
 
     def grow(self, amount):
         """Return a new Cuboid with all sides grown by the given amount (or
         shrunk in case of negative values).
         """
-        return Cuboid(self.x - amount, self.y - amount, self.z - amount,
+        # Only shrinking can turn the bounds around
+        create = Cuboid._from_ordered if amount >= 0 else Cuboid
+        return create(self.x - amount, self.y - amount, self.z - amount,
                       self.max_x + amount,
                       self.max_y + amount,
                       self.max_z + amount)
 
     def translate(self, x_offset, y_offset, z_offset):
         """Move the Cuboid by the given offset without changing its size"""
-        return Cuboid(self.x + x_offset, self.y + y_offset,
-                      self.z + z_offset,
-                      self.max_x + x_offset, self.max_y + y_offset,
-                      self.max_z + z_offset)
+        return Cuboid._from_ordered(self.x + x_offset, self.y + y_offset,
+                                    self.z + z_offset,
+                                    self.max_x + x_offset,
+                                    self.max_y + y_offset,
+                                    self.max_z + z_offset)
 
     def get_range_for_axis(self, axis):
         if axis == 2:  # Z-Axis
@@ -1,4 +1,5 @@
 import logging
+import weakref
 
 from .collision_check import BoxCollision
 from .geometry import Rectangle, Cuboid
@@ -6,6 +7,9 @@ from .geometry import Rectangle, Cuboid
 
 # Default padding, if not specified in config, in mm
 DEFAULT_PADDING = 5
+# Accepted config values for material_condition and gantry_orientation
+MATERIAL_CONDITIONS = {"exact": "exact", "type": "type", "any": "any"}
+GANTRY_ORIENTATIONS = {"x": True, "y": False}
 
 class CollisionInterface:
 
@@ -15,7 +19,7 @@ class CollisionInterface:
                 'continuous_printing', False)
         self.reposition = config.getboolean('reposition', False)
         self.material_condition = config.getchoice('material_condition',
-                {'exact': "exact", "type": "type", "any": "any"}, "any")
+                                                   MATERIAL_CONDITIONS, "any")
 
         printbed = self._read_printbed()
         printhead = self._read_printhead()
@@ -25,6 +29,10 @@ class CollisionInterface:
 
         self.collision = BoxCollision(printbed, printhead, gantry,
                                       gantry_x_oriented, gantry_height, padding)
+        # Cuboids of print jobs that were already converted. The metadata of a
+        # print job doesn't change, but it gets looked at multiple times,
+        # e.g. when checking for collisions and then searching an offset.
+        self._cuboid_cache = weakref.WeakKeyDictionary()
         self.printer = config.get_printer()
         self.printer.register_event_handler(
                 "virtual_sdcard:print_end", self._handle_print_end)
@@ -58,7 +66,7 @@ class CollisionInterface:
         xy_min = config.getfloat("gantry_xy_min")
         xy_max = config.getfloat("gantry_xy_max")
         x_oriented = config.getchoice("gantry_orientation",
-                                      {"x": True, "y": False})
+                                      GANTRY_ORIENTATIONS)
         if x_oriented:
             gantry = Rectangle(printbed.x, -xy_min,
                                printbed.width, xy_max)
@@ -71,11 +79,14 @@ class CollisionInterface:
         if not self.continuous_printing:
             return not self.collision.current_objects, (0, 0)
         try:
-            available = not self.printjob_collides(printjob)
-            offset = (0, 0)
-            if not available and self.reposition:
+            if self.reposition:
+                # find_offset checks for a collision without offset first and
+                # then gives (0, 0), so there is no need to check separately
                 offset = self.find_offset(printjob)
                 available = offset is not None
+            else:
+                available = not self.printjob_collides(printjob)
+                offset = (0, 0)
             available = available and self.check_material(printjob)
             return available, offset
         except MissingMetadataError:
@@ -140,7 +151,11 @@ class CollisionInterface:
         """Create a Cuboid from a virtual_sdcard.PrintJob object.
         A ValueError can be propagated from metadata_to_cuboid.
         """
-        return self.metadata_to_cuboid(printjob.md)
+        cuboid = self._cuboid_cache.get(printjob)
+        if cuboid is None:
+            cuboid = self.metadata_to_cuboid(printjob.md)
+            self._cuboid_cache[printjob] = cuboid
+        return cuboid
 
     ##
     ## Wrapper functions that take care of converting printjobs to cuboids
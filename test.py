@@ -4,6 +4,7 @@ import configparser
 import copy
 import os
 import random
+import time
 import unittest
 
 import site
@@ -13,7 +14,7 @@ site.addsitedir(os.path.dirname(_extras_dir))  # For configfile module
 
 import configfile
 
-from collision import geometry, load_config
+from collision import collision_check, geometry, load_config
 
 
 # Needed to create ConfigWrapper
@@ -23,6 +24,30 @@ class _DummyPrinter:
         pass
 
 CONFIG_FILE = "test_config.cfg"
+with open(CONFIG_FILE, "r") as fp:
+    CONFIG_TEXT = fp.read()
+
+
+def _make_collision(**options):
+    """Parse the test config, overriding options in the collision section,
+    and return the resulting BoxCollision
+    """
+    fileconfig = configparser.RawConfigParser(strict=False)
+    fileconfig.read_string(CONFIG_TEXT, CONFIG_FILE)
+    for option, value in options.items():
+        fileconfig.set("collision", option, value)
+    config = configfile.ConfigWrapper(
+        _DummyPrinter(), fileconfig, {}, "collision")
+    return load_config(config).collision
+
+
+def _rectangle_fields(r):
+    return (r.x, r.y, r.width, r.height, r.max_x, r.max_y, r.get_area())
+
+
+def _cuboid_fields(c):
+    return (c.x, c.y, c.z, c.width, c.height, c.z_height,
+            c.max_x, c.max_y, c.max_z, c.get_volume())
 
 
 
@@ -30,31 +55,25 @@ class GeometryTest(unittest.TestCase):
 
     def test_rectangle(self):
         rectangle = geometry.Rectangle(10, 15, 14, 20)
-        self.assertEqual(rectangle.x, 10)
-        self.assertEqual(rectangle.y, 15)
-        self.assertEqual(rectangle.width, 4)
-        self.assertEqual(rectangle.height, 5)
-        self.assertEqual(rectangle.max_x, 14)
-        self.assertEqual(rectangle.max_y, 20)
-        self.assertEqual(rectangle.get_area(), 20)
+        self.assertEqual(_rectangle_fields(rectangle),
+                         (10, 15, 4, 5, 14, 20, 20))
+        self.assertEqual(rectangle.as_tuple(), (10, 15, 14, 20))
 
     def test_rectangle_negative(self):
         rectangle = geometry.Rectangle(5, 10, -15, -20)
-        self.assertEqual(rectangle.x, -15)
-        self.assertEqual(rectangle.y, -20)
-        self.assertEqual(rectangle.width, 20)
-        self.assertEqual(rectangle.height, 30)
-        self.assertEqual(rectangle.max_x, 5)
-        self.assertEqual(rectangle.max_y, 10)
-        self.assertEqual(rectangle.get_area(), 600)
+        self.assertEqual(_rectangle_fields(rectangle),
+                         (-15, -20, 20, 30, 5, 10, 600))
 
     def test_rectangle_bool(self):
-        # Rectangle with positive area
-        r1 = geometry.Rectangle(2, 3, 3, 4)
-        # Rectangle with area 0
-        r2 = geometry.Rectangle(2, 3, 2, 3)
-        self.assertTrue(r1)
-        self.assertFalse(r2)
+        cases = [
+            (geometry.Rectangle(2, 3, 3, 4), True),  # Positive area
+            (geometry.Rectangle(2, 3, 2, 3), False),  # Area 0
+            (geometry.Rectangle(3, 4, 2, 3), True),  # Bounds given in reverse
+            (geometry.Rectangle(2, 3, 5, 3), False),  # Only a line
+        ]
+        for rectangle, expected in cases:
+            with self.subTest(rectangle=rectangle.as_tuple()):
+                self.assertIs(bool(rectangle), expected)
 
     def test_rectangle_eq(self):
         r1 = geometry.Rectangle(4, 6, 8, 8)
@@ -83,6 +102,13 @@ class GeometryTest(unittest.TestCase):
         self.assertEqual(r5.intersection(r1), r5)
         self.assertEqual(r1.intersection(r1), r1)
 
+        # Overlap area matches the area of the intersection
+        for other in (r1, r2, r3, r4, r5, r6, r7):
+            self.assertEqual(r1.get_overlap_area(other),
+                             r1.intersection(other).get_area())
+            self.assertEqual(other.get_overlap_area(r1),
+                             r1.intersection(other).get_area())
+
         # Collision
         self.assertTrue(r1.collides_with(r2))
         self.assertTrue(r2.collides_with(r1))
@@ -98,40 +124,36 @@ class GeometryTest(unittest.TestCase):
         self.assertTrue(r6.collides_with(r1, 1))
         self.assertFalse(r1.collides_with(r7, 1))
 
+    def test_rectangle_contains(self):
+        r1 = geometry.Rectangle(0, 0, 8, 4)
+        self.assertTrue(r1.contains(r1))
+        self.assertTrue(r1.contains(geometry.Rectangle(1, 1, 7, 3)))
+        self.assertTrue(r1.contains(geometry.Rectangle(0, 1, 8, 3)))
+        self.assertFalse(r1.contains(geometry.Rectangle(2, 2, 6, 10)))
+        self.assertFalse(r1.contains(geometry.Rectangle(-1, 0, 8, 4)))
+        self.assertFalse(r1.contains(geometry.Rectangle(50, 50, 60, 60)))
 
     def test_cuboid(self):
         cuboid = geometry.Cuboid(10, 15, 20, 30, 40, 30)
-        self.assertEqual(cuboid.x, 10)
-        self.assertEqual(cuboid.y, 15)
-        self.assertEqual(cuboid.z, 20)
-        self.assertEqual(cuboid.width, 20)
-        self.assertEqual(cuboid.height, 25)
-        self.assertEqual(cuboid.z_height, 10)
-
-        self.assertEqual(cuboid.max_x, 30)
-        self.assertEqual(cuboid.max_y, 40)
-        self.assertEqual(cuboid.max_z, 30)
-        self.assertEqual(cuboid.get_volume(), 5000)
+        self.assertEqual(_cuboid_fields(cuboid),
+                         (10, 15, 20, 20, 25, 10, 30, 40, 30, 5000))
+        self.assertEqual(cuboid.as_tuple(), (10, 15, 20, 30, 40, 30))
 
     def test_cuboid_negative(self):
         cuboid = geometry.Cuboid(5, 20, 5, -5, 15, -15)
-        self.assertEqual(cuboid.x, -5)
-        self.assertEqual(cuboid.y, 15)
-        self.assertEqual(cuboid.z, -15)
-        self.assertEqual(cuboid.width, 10)
-        self.assertEqual(cuboid.height, 5)
-        self.assertEqual(cuboid.z_height, 20)
-
-        self.assertEqual(cuboid.max_x, 5)
-        self.assertEqual(cuboid.max_y, 20)
-        self.assertEqual(cuboid.max_z, 5)
-        self.assertEqual(cuboid.get_volume(), 1000)
+        self.assertEqual(_cuboid_fields(cuboid),
+                         (-5, 15, -15, 10, 5, 20, 5, 20, 5, 1000))
 
     def test_cuboid_bool(self):
-        c1 = geometry.Cuboid(2, 2, 2, 7, 5, 3)
-        self.assertTrue(c1)
-        c2 = geometry.Cuboid(2, 2, 2, 7, 2, 3)
-        self.assertFalse(c2)
+        cases = [
+            (geometry.Cuboid(2, 2, 2, 7, 5, 3), True),
+            (geometry.Cuboid(2, 2, 2, 7, 2, 3), False),  # No depth on Y
+            (geometry.Cuboid(7, 5, 3, 2, 2, 2), True),  # Bounds given in reverse
+            (geometry.Cuboid(2, 2, 2, 7, 5, 2), False),  # Flat on Z
+        ]
+        for cuboid, expected in cases:
+            with self.subTest(cuboid=cuboid.as_tuple()):
+                self.assertIs(bool(cuboid), expected)
 
     def test_cuboid_eq(self):
         c1 = geometry.Cuboid(1, 2, 3, 4, 5, 6)
@@ -159,6 +181,13 @@ class GeometryTest(unittest.TestCase):
         self.assertEqual(c5.intersection(c1), c5)
         self.assertEqual(c1.intersection(c1), c1)
 
+        # Overlap volume matches the volume of the intersection
+        for other in (c1, c2, c3, c4, c5, c6, c7):
+            self.assertEqual(c1.get_overlap_volume(other),
+                             c1.intersection(other).get_volume())
+            self.assertEqual(other.get_overlap_volume(c1),
+                             c1.intersection(other).get_volume())
+
         # Collision
         self.assertTrue(c1.collides_with(c2))
         self.assertTrue(c2.collides_with(c1))
@@ -174,23 +203,70 @@ class GeometryTest(unittest.TestCase):
         self.assertTrue(c6.collides_with(c1, 5))
         self.assertFalse(c1.collides_with(c7, 5))
 
+    def test_cuboid_contains(self):
+        c1 = geometry.Cuboid(0, 0, 0, 20, 15, 10)
+        self.assertTrue(c1.contains(c1))
+        self.assertTrue(c1.contains(geometry.Cuboid(2, 2, 2, 14, 10, 8)))
+        self.assertTrue(c1.contains(geometry.Cuboid(0, 0, 5, 20, 15, 10)))
+        self.assertFalse(c1.contains(geometry.Cuboid(5, 5, 5, 15, 25, 35)))
+        self.assertFalse(c1.contains(geometry.Cuboid(0, 0, -1, 20, 15, 10)))
+        self.assertFalse(c1.contains(geometry.Cuboid(50, 50, 50, 60, 60, 60)))
+
+    def test_slots(self):
+        # Neither class should get a __dict__ back by accident
+        rectangle = geometry.Rectangle(0, 0, 1, 1)
+        cuboid = geometry.Cuboid(0, 0, 0, 1, 1, 1)
+        self.assertFalse(hasattr(rectangle, "__dict__"))
+        self.assertFalse(hasattr(cuboid, "__dict__"))
+        with self.assertRaises(AttributeError):
+            rectangle.area = 1
+        # Copying still works without a __dict__
+        self.assertEqual(copy.copy(rectangle), rectangle)
+        self.assertEqual(copy.deepcopy(cuboid), cuboid)
+
+    def test_hash(self):
+        # Equal shapes hash the same, so duplicates collapse in a set
+        rectangles = {geometry.Rectangle(0, 0, 4, 5),
+                      geometry.Rectangle(4, 5, 0, 0),
+                      geometry.Rectangle(0, 0, 4, 6)}
+        self.assertEqual(len(rectangles), 2)
+        cuboids = {geometry.Cuboid(0, 0, 0, 4, 5, 6),
+                   geometry.Cuboid(4, 5, 6, 0, 0, 0),
+                   geometry.Cuboid(0, 0, 1, 4, 5, 6)}
+        self.assertEqual(len(cuboids), 2)
+
+    def test_random_intersections(self):
+        # Compare collides_with, intersection and the overlap size on many
+        # random pairs, including degenerate and reversed bounds
+        rng = random.Random(1234)
+        def coord():
+            return rng.randint(-20, 20)
+        for _ in range(500):
+            r1 = geometry.Rectangle(*(coord() for _ in range(4)))
+            r2 = geometry.Rectangle(*(coord() for _ in range(4)))
+            with self.subTest(r1=r1.as_tuple(), r2=r2.as_tuple()):
+                self.assertEqual(r1.intersection(r2), r2.intersection(r1))
+                self.assertEqual(r1.collides_with(r2),
+                                 r1.get_overlap_area(r2) > 0)
+                self.assertEqual(r1.get_overlap_area(r2),
+                                 r1.intersection(r2).get_area())
+
+            c1 = geometry.Cuboid(*(coord() for _ in range(6)))
+            c2 = geometry.Cuboid(*(coord() for _ in range(6)))
+            with self.subTest(c1=c1.as_tuple(), c2=c2.as_tuple()):
+                self.assertEqual(c1.intersection(c2), c2.intersection(c1))
+                self.assertEqual(c1.collides_with(c2),
+                                 c1.get_overlap_volume(c2) > 0)
+                self.assertEqual(c1.get_overlap_volume(c2),
+                                 c1.intersection(c2).get_volume())
+
 
 class CollisionTest(unittest.TestCase):
 
     def setUp(self):
-        fileconfig = configparser.RawConfigParser(strict=False)
-        with open(CONFIG_FILE, "r") as fp:
-            fileconfig.read_file(fp)
-        config = configfile.ConfigWrapper(
-            _DummyPrinter(), fileconfig, {}, "collision")
-        self.collision = load_config(config).collision
-
+        self.collision = _make_collision()
         # Make another collision object but with an x-oriented gantry
-        fc_x = copy.deepcopy(fileconfig)
-        fc_x.set("collision", "gantry_orientation", "x")
-        config_x = configfile.ConfigWrapper(
-            _DummyPrinter(), fc_x, {}, "collision")
-        self.collision_x = load_config(config_x).collision
+        self.collision_x = _make_collision(gantry_orientation="x")
 
     def test_attributes(self):
         c = self.collision
@@ -200,11 +276,35 @@ class CollisionTest(unittest.TestCase):
         self.assertIsInstance(c.gantry_x_oriented, bool)
         self.assertIsInstance(c.gantry_height, float)
         self.assertGreaterEqual(c.gantry_height, 0)
-        self.assertEqual(c.current_objects, [])
+        self.assertEqual(c.current_objects, ())
 
         self.assertFalse(c.gantry_x_oriented)
         self.assertTrue(self.collision_x.gantry_x_oriented)
 
+    def test_current_objects(self):
+        c = self.collision
+        obj = geometry.Cuboid(0, 0, 0, 50, 50, 50)
+        objects = [obj]
+        with_objects = collision_check.BoxCollision(
+            c.printbed, c.printhead, c.gantry, c.gantry_x_oriented,
+            c.gantry_height, c.padding, objects)
+        self.assertEqual(with_objects.current_objects, (obj,))
+        self.assertTrue(with_objects.object_collides(obj))
+        new_object = geometry.Cuboid(200, 200, 0, 220, 220, 10)
+        self.assertFalse(with_objects.object_collides(new_object))
+        # The list passed in is copied, so changing it has no effect. The
+        # objects can only be changed through the methods.
+        objects.append(new_object)
+        self.assertFalse(with_objects.object_collides(new_object))
+        with self.assertRaises(AttributeError):
+            with_objects.current_objects.append(new_object)
+        with_objects.add_object(new_object)
+        self.assertEqual(with_objects.current_objects, (obj, new_object))
+        self.assertTrue(with_objects.object_collides(new_object))
+        with_objects.clear_objects()
+        self.assertEqual(with_objects.current_objects, ())
+        self.assertFalse(with_objects.object_collides(new_object))
+
     def test_moving_parts(self):
         cy = self.collision
         cx = self.collision_x
@@ -219,6 +319,57 @@ class CollisionTest(unittest.TestCase):
         self.assertEqual(cy.moving_parts(new_object.projection()),
                          (geometry.Rectangle(-10, 50.1, 176, 252),
                          geometry.Cuboid(41.5, 0, 84, 182, 1000, float('inf'))))
+        # Copies use their own attributes
+        cy_high = copy.copy(cy)
+        cy_high.gantry_height = 100
+        self.assertEqual(cy_high.moving_parts(new_object)[1],
+                         geometry.Cuboid(41.5, 0, 100, 182, 1000, float('inf')))
+        self.assertEqual(cy.moving_parts(new_object)[1].z, 84)
+
+    def test_attribute_changes(self):
+        # A copy with changed geometry must behave exactly like a
+        # BoxCollision created with that geometry
+        rng = random.Random(5)
+        cx = self.collision_x
+        changed = copy.copy(self.collision)
+        changed.printbed = geometry.Cuboid(0, 0, 0, 400, 600, 200)
+        changed.printhead = geometry.Rectangle(-30, -20, 40, 50)
+        changed.gantry = cx.gantry
+        changed.gantry_x_oriented = True
+        expected = collision_check.BoxCollision(
+            changed.printbed, changed.printhead, changed.gantry, True,
+            changed.gantry_height, changed.padding)
+        for _ in range(10):
+            x = rng.randint(0, 350)
+            y = rng.randint(0, 550)
+            obj = geometry.Cuboid(x, y, 0, x + 50, y + 50, 100)
+            self.assertEqual(changed.moving_parts(obj),
+                             expected.moving_parts(obj))
+            self.assertEqual(changed.object_collides(obj),
+                             expected.object_collides(obj))
+            self.assertEqual(changed.find_offset(obj),
+                             expected.find_offset(obj))
+            changed.add_object(obj)
+            expected.add_object(obj)
+
+    def test_fits_in_printer(self):
+        c = self.collision
+        self.assertTrue(c.fits_in_printer(c.printbed))
+        self.assertTrue(c.fits_in_printer(
+            geometry.Cuboid(10, 20, 0, 100, 200, 50)))
+        self.assertFalse(c.fits_in_printer(
+            geometry.Cuboid(450, 20, 0, 550, 200, 50)))
+        self.assertFalse(c.fits_in_printer(
+            geometry.Cuboid(-10, 20, 0, 100, 200, 50)))
+        # Without extent on an axis, an object beyond the upper end of the
+        # printer on that axis still counts as fitting, but not one below
+        # the lower end
+        self.assertTrue(c.fits_in_printer(
+            geometry.Cuboid(500.7, 235.7, 16.4, 500.7, 306.6, 16.4)))
+        self.assertEqual(c.find_offset(
+            geometry.Cuboid(500.7, 235.7, 16.4, 500.7, 306.6, 16.4)), (0, 0))
+        self.assertFalse(c.fits_in_printer(
+            geometry.Cuboid(-0.5, 235.7, 16.4, -0.5, 306.6, 16.4)))
 
     def test_collision(self):
         cy = self.collision
@@ -307,6 +458,82 @@ class CollisionTest(unittest.TestCase):
         cy.clear_objects()
         cx.clear_objects()
 
+    def test_collision_padded_copy(self):
+        # Copies share the objects, also when their padding is changed
+        c = self.collision
+        obj = geometry.Cuboid(100, 100, 0, 150, 150, 50)
+        other = geometry.Cuboid(300, 600, 0, 350, 650, 50)
+        self.assertFalse(c.object_collides(obj))
+        padded = copy.copy(c)
+        padded.padding = 3
+        padded.add_object(obj)
+        self.assertTrue(c.object_collides(obj))
+        self.assertTrue(padded.object_collides(obj))
+        c.clear_objects()
+        padded.add_object(other)
+        self.assertFalse(padded.object_collides(obj))
+        self.assertFalse(c.object_collides(obj))
+        self.assertTrue(c.object_collides(other))
+        c.clear_objects()
+
+    def test_object_collides_bulk(self):
+        # The indexed collision check must agree with testing every object
+        # on its own, for both gantry orientations and different paddings
+        rng = random.Random(42)
+        def random_cuboid():
+            x = rng.randint(0, 450) + rng.randint(0, 9) / 10
+            y = rng.randint(0, 950) + rng.randint(0, 9) / 10
+            return geometry.Cuboid(x, y, 0, x + rng.uniform(1, 60),
+                                   y + rng.uniform(1, 60),
+                                   rng.uniform(10, 150))
+        for c in (self.collision, self.collision_x):
+            for padding in (0, 3, 5) * 5:
+                c.padding = padding
+                c.clear_objects()
+                for _ in range(rng.randint(1, 4)):
+                    c.add_object(random_cuboid())
+                for _ in range(20):
+                    new_object = random_cuboid()
+                    printhead, gantry = c.moving_parts(new_object)
+                    expected = not c.fits_in_printer(new_object) or any(
+                        new_object.collides_with(obj, padding) or
+                        printhead.collides_with(obj.projection(), padding) or
+                        gantry.collides_with(obj, padding)
+                        for obj in c.current_objects)
+                    self.assertEqual(c.object_collides(new_object), expected)
+
+    def test__sorted_index(self):
+        index = collision_check._SortedIndex()
+        ranges = [(40, 60), (0, 10), (5, 100), (70, 80), (10, 20)]
+        for i, r in enumerate(ranges):
+            index.insert(i, *r)
+        self.assertEqual(len(index), 5)
+
+        # All overlapping ranges must be among the candidates
+        for q_min, q_max in [(0, 5), (10, 40), (61, 69), (80, 90), (-5, 0)]:
+            overlapping = {i for i, (r_min, r_max) in enumerate(ranges)
+                           if q_max > r_min and r_max > q_min}
+            self.assertLessEqual(overlapping,
+                                 set(index.query(q_min, q_max)))
+        # Ranges entirely above the query are always pruned
+        self.assertNotIn(3, index.query(0, 30))
+
+        index.clear()
+        self.assertEqual(index.query(-1000, 1000), [])
+
+        # Filled on creation
+        index = collision_check._SortedIndex(
+            (i, *r) for i, r in enumerate(ranges))
+        self.assertEqual(set(index.query(-1000, 1000)), set(range(5)))
+        self.assertLessEqual({0, 2}, set(index.query(41, 42)))
+        self.assertNotIn(3, index.query(41, 42))
+
+        # Rounding when subtracting the largest extent must not prune a
+        # range that only just reaches into the query
+        r_min, r_max = -262.20943544328026, 12.896255291204682
+        index = collision_check._SortedIndex([(0, r_min, r_max)])
+        self.assertEqual(index.query(12.89625529120468, 20), [0])
+
 
 class FinderTest(unittest.TestCase):
 
@@ -327,8 +554,9 @@ class FinderTest(unittest.TestCase):
         uncondensed = [[-2, 0], [-1, 0], [4, 10], [5, 8], [9, 12], [13, 18]]
         self.assertEqual(c._condense_ranges(uncondensed),
             [[-2, 0], [4, 12], [13, 18]])
-        # Redefine the list because it might get mutated
-        uncondensed = [[-2, 0], [-1, 0], [4, 10], [5, 8], [9, 12], [13, 18]]
+        # The input isn't mutated
+        self.assertEqual(uncondensed,
+            [[-2, 0], [-1, 0], [4, 10], [5, 8], [9, 12], [13, 18]])
         self.assertEqual(c._condense_ranges(uncondensed, 1),
             [[-2, 0], [4, 18]])
 
@@ -342,6 +570,33 @@ class FinderTest(unittest.TestCase):
         self.assertEqual(c._condense_ranges([]), [])
         self.assertEqual(c._condense_ranges([[5, 10]]), [[5, 10]])
 
+    def test__sweep_degenerate(self):
+        # Like collides_with, the sweep must not count boxes without any
+        # extent as colliding, whether they are objects or gantry stripes
+        rng = random.Random(3)
+        def random_box():
+            x = rng.randint(100, 200)
+            y = rng.randint(100, 200)
+            return geometry.Rectangle(x, y, x + rng.randint(0, 3) * 10,
+                                      y + rng.randint(0, 3) * 10)
+        for c in (self.collision, self.collision_x):
+            for _ in range(50):
+                new_object = random_box()
+                space = c.moving_parts(new_object)[0].grow(c.padding)
+                boxes = [random_box() for _ in range(4)]
+                ranges = c._get_axis_ranges(boxes)
+                # The sweep only stays at offset 0 without any collision
+                main_ranges = c._get_main_ranges(
+                    *space.get_range_for_axis(c._side_axis), ranges)
+                self.assertEqual(
+                    c._sweep(new_object, space, [], main_ranges) != [0, 0],
+                    any(space.collides_with(r) for r in boxes))
+                main_ranges = c._get_main_ranges(
+                    *new_object.get_range_for_axis(c._side_axis), ranges)
+                self.assertEqual(
+                    c._sweep(new_object, space, main_ranges, []) != [0, 0],
+                    any(new_object.collides_with(r) for r in boxes))
+
     def test_get_gantry_collisions(self):
         cy = self.collision
         cx = self.collision_x
@@ -526,6 +781,55 @@ def _round_tuple(numbers, ndigits=4):
     return tuple(round(n, ndigits) for n in numbers)
 
 
+@unittest.skipUnless(os.environ.get("BENCH"), "Set BENCH=1 to run benchmarks")
+class BenchmarkTest(unittest.TestCase):
+    """Timings of the hot paths, printed for comparing changes on the same
+    machine. Nothing is asserted about the times themselves, since they
+    depend entirely on the host running the tests.
+    """
+
+    def setUp(self):
+        self.collision = _make_collision()
+
+    def _time(self, name, func, *args, repeat):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func(*args)
+        elapsed = time.perf_counter() - start
+        print("\n{}: {} calls in {:.3f}s ({:.2f}us per call)".format(
+            name, repeat, elapsed, elapsed / repeat * 1e6))
+
+    def test_bench_object_collides(self):
+        c = self.collision
+        # A grid of objects all over the printbed, so that many candidates
+        # have to be checked before the first collision is found
+        for x in range(10, 490, 60):
+            for y in range(10, 990, 125):
+                c.add_object(geometry.Cuboid(x, y, 0, x + 30, y + 30, 50))
+        colliding = geometry.Cuboid(400, 900, 0, 450, 950, 40)
+        self.assertTrue(c.object_collides(colliding))
+        self._time("object_collides (colliding)",
+                   c.object_collides, colliding, repeat=100000)
+
+        # A column of objects along one edge that the index can prune
+        c.clear_objects()
+        for y in range(10, 990, 60):
+            c.add_object(geometry.Cuboid(10, y, 0, 40, y + 30, 50))
+        free = geometry.Cuboid(300, 400, 0, 320, 420, 40)
+        self.assertFalse(c.object_collides(free))
+        self._time("object_collides (free)",
+                   c.object_collides, free, repeat=100000)
+
+    def test_bench_intersection(self):
+        r1 = geometry.Rectangle(0, 0, 8, 4)
+        r2 = geometry.Rectangle(2, 2, 6, 10)
+        c1 = geometry.Cuboid(0, 0, 0, 20, 15, 10)
+        c2 = geometry.Cuboid(5, 5, 5, 15, 25, 35)
+        self._time("Rectangle.intersection",
+                   r1.intersection, r2, repeat=1000000)
+        self._time("Cuboid.intersection",
+                   c1.intersection, c2, repeat=1000000)
+
 
 if __name__ == '__main__':
     unittest.main()